@@ -1,14 +1,16 @@
 import os
 os.environ["MPLBACKEND"] = "Agg"
 
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
 import numpy as np
 import matplotlib.pyplot as plt
-import imageio.v2 as imageio
-
-# ============================================================
-# OUTPUT
-# ============================================================
-OUT = "Spirograma_Dinamico_Tidal_Manobras_Forcadas_AULA_LIMPA.mp4"
+from matplotlib.colors import to_rgb
+from matplotlib.transforms import Bbox
+import imageio_ffmpeg
 
 # ============================================================
 # VIDEO SETTINGS
@@ -17,37 +19,46 @@ FPS = 20
 DURATION_S = 60
 W, H = 12.8, 7.2
 DPI = 100  # 1280x720
+TOTAL_FRAMES = int(DURATION_S * FPS)
 
 # ============================================================
-# DIDACTIC VOLUMES (mL) — coerentes por construção
+# CONFIG — volumes didácticos (mL) + timing (s) de uma variante
 # ============================================================
-TLC = 6000.0   # CPT (TLC)
-RV  = 1200.0   # VR (RV)
-ERV = 1100.0   # VRE (ERV)
-VT  = 500.0    # VT (VT)
-
-FRC = RV + ERV                 # CRF (FRC)
-IRV = TLC - (FRC + VT)         # VRI (IRV) coerente
-IC  = TLC - FRC                # CI (IC)
-VC  = TLC - RV                 # CV (VC)
-
-IRV = max(IRV, 0.0)
+class Config(NamedTuple):
+    """
+    Constantes que mudam entre variantes do vídeo.
+    """
+    tlc: float = 6000.0        # CPT (TLC)
+    rv: float = 1200.0         # VR (RV)
+    erv: float = 1100.0        # VRE (ERV)
+    vt: float = 500.0          # VT (VT)
+
+    # ciclo fixo 30 s (repete 2x em 60 s)
+    t_tidal_1: float = 12.0
+    t_hold_1: float = 1.0
+    t_fexp: float = 6.0
+    t_hold_2: float = 1.0
+    t_fins: float = 6.0
+    t_hold_3: float = 1.0
+    t_tidal_2: float = 3.0
+
+    tidal_1_breaths: float = 3.0
+
+    @property
+    def frc(self) -> float:
+        return self.rv + self.erv                       # CRF (FRC)
+
+    @property
+    def t_cycle(self) -> float:
+        return (self.t_tidal_1 + self.t_hold_1 + self.t_fexp + self.t_hold_2
+                + self.t_fins + self.t_hold_3 + self.t_tidal_2)
 
 # ============================================================
-# TIMING (s) — ciclo fixo 30 s (repete 2x em 60 s)
+# OUTPUT
 # ============================================================
-T_TIDAL_1 = 12.0
-T_HOLD_1  = 1.0
-T_FEXP    = 6.0
-T_HOLD_2  = 1.0
-T_FINS    = 6.0
-T_HOLD_3  = 1.0
-T_TIDAL_2 = 3.0
-
-T_CYCLE = T_TIDAL_1 + T_HOLD_1 + T_FEXP + T_HOLD_2 + T_FINS + T_HOLD_3 + T_TIDAL_2  # 30s
-
-FEXP_TARGET = RV
-FINS_TARGET = TLC
+CONFIGS = {
+    "Spirograma_Dinamico_Tidal_Manobras_Forcadas_AULA_LIMPA.mp4": Config(),
+}
 
 def smoothstep(x: float) -> float:
     x = np.clip(x, 0.0, 1.0)
@@ -58,93 +69,101 @@ def ease_out_fast_then_slow(x: float) -> float:
     x = np.clip(x, 0.0, 1.0)
     return 1.0 - (1.0 - x)**2
 
-def phase_in_cycle(tau):
-    a = T_TIDAL_1
-    b = a + T_HOLD_1
-    c = b + T_FEXP
-    d = c + T_HOLD_2
-    e = d + T_FINS
-    f = e + T_HOLD_3
-    if tau < a:
-        return "tidal1", tau / max(T_TIDAL_1, 1e-9)
-    if tau < b:
-        return "hold1", (tau - a) / max(T_HOLD_1, 1e-9)
-    if tau < c:
-        return "fexp", (tau - b) / max(T_FEXP, 1e-9)
-    if tau < d:
-        return "hold2", (tau - c) / max(T_HOLD_2, 1e-9)
-    if tau < e:
-        return "fins", (tau - d) / max(T_FINS, 1e-9)
-    if tau < f:
-        return "hold3", (tau - e) / max(T_HOLD_3, 1e-9)
-    return "tidal2", (tau - f) / max(T_TIDAL_2, 1e-9)
-
-def tidal_volume(xlocal: float, breaths: float) -> float:
+def phase_bounds(cfg):
+    """
+    Fim de cada fase dentro do ciclo (tidal1, hold1, fexp, hold2, fins, hold3).
+    """
+    a = cfg.t_tidal_1
+    b = a + cfg.t_hold_1
+    c = b + cfg.t_fexp
+    d = c + cfg.t_hold_2
+    e = d + cfg.t_fins
+    f = e + cfg.t_hold_3
+    return a, b, c, d, e, f
+
+def tidal_volume(xlocal: float, breaths: float, cfg) -> float:
     """
     VT correcto: vai de CRF -> CRF+VT -> CRF (não desce para VRE).
     """
     theta = 2.0 * np.pi * breaths * xlocal
-    return FRC + (VT / 2.0) * (1.0 - np.cos(theta))  # [FRC .. FRC+VT]
-
-def volume_of_tau(tau: float) -> float:
-    ph, x = phase_in_cycle(tau)
-
-    if ph == "tidal1":
-        return tidal_volume(x, breaths=3.0)
-
-    if ph == "hold1":
-        return FRC
-
-    if ph == "fexp":
-        v0 = FRC + VT
-        k = ease_out_fast_then_slow(x)
-        return v0 + (FEXP_TARGET - v0) * k
-
-    if ph == "hold2":
-        return FEXP_TARGET
-
-    if ph == "fins":
-        v0 = FEXP_TARGET
-        k = ease_out_fast_then_slow(x)
-        return v0 + (FINS_TARGET - v0) * k
-
-    if ph == "hold3":
-        return FINS_TARGET
+    return cfg.frc + (cfg.vt / 2.0) * (1.0 - np.cos(theta))  # [FRC .. FRC+VT]
 
-    if ph == "tidal2":
-        # 1ª metade: volta de TLC -> CRF
-        if x < 0.5:
-            k = ease_out_fast_then_slow(x / 0.5)
-            return TLC + (FRC - TLC) * k
-        # 2ª metade: 1 tidal
-        xx = (x - 0.5) / 0.5
-        return tidal_volume(xx, breaths=1.0)
+def volume_of_tau_vec(tau: np.ndarray, cfg: Config) -> np.ndarray:
+    """
+    Volume (mL) em cada instante tau do ciclo, para um array de tau.
+    Fases: tidal -> pausa CRF -> expiração forçada -> pausa VR ->
+    inspiração forçada -> pausa CPT -> retorno a CRF + 1 tidal.
+    """
+    a, b, c, d, e, f = phase_bounds(cfg)
+    frc = cfg.frc
+    fexp_target = cfg.rv
+    fins_target = cfg.tlc
+
+    x_tidal1 = tau / max(cfg.t_tidal_1, 1e-9)
+    x_fexp = (tau - b) / max(cfg.t_fexp, 1e-9)
+    x_fins = (tau - d) / max(cfg.t_fins, 1e-9)
+    x_tidal2 = (tau - f) / max(cfg.t_tidal_2, 1e-9)
+
+    v_fexp = (frc + cfg.vt) + (fexp_target - (frc + cfg.vt)) * ease_out_fast_then_slow(x_fexp)
+    v_fins = fexp_target + (fins_target - fexp_target) * ease_out_fast_then_slow(x_fins)
+    v_tidal2 = np.where(
+        x_tidal2 < 0.5,
+        cfg.tlc + (frc - cfg.tlc) * ease_out_fast_then_slow(x_tidal2 / 0.5),
+        tidal_volume((x_tidal2 - 0.5) / 0.5, breaths=1.0, cfg=cfg),
+    )
 
-    return FRC
+    return np.select(
+        [tau < a, tau < b, tau < c, tau < d, tau < e, tau < f],
+        [tidal_volume(x_tidal1, breaths=cfg.tidal_1_breaths, cfg=cfg), frc, v_fexp, fexp_target, v_fins, fins_target],
+        default=v_tidal2,
+    )
 
-# ============================================================
-# Precompute cycle curve
-# ============================================================
 N_CURVE = 2400
-t_curve = np.linspace(0.0, T_CYCLE, N_CURVE)
-v_curve = np.array([volume_of_tau(tt) for tt in t_curve])
-
-PHASE_LABEL = {
-    "tidal1": "Respiração tranquila (VT)",
-    "hold1":  "Pausa em CRF",
-    "fexp":   "Expiração forçada até VR",
-    "hold2":  "Pausa em VR",
-    "fins":   "Inspiração forçada até CPT",
-    "hold3":  "Pausa em CPT",
-    "tidal2": "Retorno a CRF + retoma VT",
-}
+
+# indexado pela fase (np.digitize de tau em phase_bounds)
+PHASE_LABEL = [
+    "Respiração tranquila (VT)",     # tidal1
+    "Pausa em CRF",                  # hold1
+    "Expiração forçada até VR",      # fexp
+    "Pausa em VR",                   # hold2
+    "Inspiração forçada até CPT",    # fins
+    "Pausa em CPT",                  # hold3
+    "Retorno a CRF + retoma VT",     # tidal2
+]
+LABELS = [f"Fase: {lbl}" for lbl in PHASE_LABEL]
 
 # ============================================================
 # Render helpers
 # ============================================================
-def canvas_to_rgb(fig):
-    fig.canvas.draw()
-    return np.asarray(fig.canvas.buffer_rgba())[:, :, :3].copy()
+def open_ffmpeg(out_path, size, fps, threads=0):
+    """
+    Abre o ffmpeg a ler frames RGBA crus do stdin (sem cópias intermédias).
+    threads=0 deixa o x264 escolher; com vários encoders em paralelo usar 1.
+    """
+    w, h = size
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{w}x{h}", "-r", str(fps),
+        "-i", "-",
+        "-c:v", "libx264", "-preset", "faster", "-crf", "23", "-tune", "stillimage",
+        "-threads", str(threads), "-pix_fmt", "yuv420p",
+        out_path,
+    ]
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+def concat_segments(segments, out_path):
+    """
+    Junta segmentos (mesmo encoder) num só vídeo com o concat demuxer, sem re-encode.
+    """
+    list_path = os.path.join(os.path.dirname(segments[0]), "concat.txt")
+    with open(list_path, "w") as fh:
+        fh.writelines(f"file '{seg}'\n" for seg in segments)
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+        "-f", "concat", "-safe", "0", "-i", list_path,
+        "-c", "copy", out_path,
+    ]
+    subprocess.run(cmd, check=True)
 
 # ============================================================
 # STYLE HELPERS
@@ -158,54 +177,75 @@ def label_box(ax, x, y, text, ha="left", va="center", fs=11, weight="bold", alph
     )
 
 # ============================================================
-# FIGURE + VIDEO WRITER
+# RENDER
 # ============================================================
-fig = plt.figure(figsize=(W, H), dpi=DPI)
-writer = imageio.get_writer(
-    OUT,
-    fps=FPS,
-    codec="libx264",
-    macro_block_size=1,
-    ffmpeg_params=["-preset", "ultrafast", "-crf", "24", "-pix_fmt", "yuv420p"]
-)
-
-total_frames = int(DURATION_S * FPS)
-
-for i in range(total_frames):
-    t = i / FPS
-    tau = t % T_CYCLE
-    ph, _ = phase_in_cycle(tau)
-
-    # progresso até tau
-    mask = t_curve <= tau
-    t_prog = t_curve[mask]
-    v_prog = v_curve[mask]
-    v_now = volume_of_tau(tau)
-
-    fig.clf()
+def render_range(cfg: Config, i0: int, i1: int, out_path: str, threads: int = 0) -> str:
+    """
+    Renderiza os frames [i0, i1) para out_path (um segmento do vídeo final).
+    """
+    tlc, rv, vt = cfg.tlc, cfg.rv, cfg.vt
+    frc = cfg.frc
+    t_cycle = cfg.t_cycle
+
+    # ============================================================
+    # Precompute cycle curve
+    # ============================================================
+    t_curve = np.linspace(0.0, t_cycle, N_CURVE)
+    v_curve = volume_of_tau_vec(t_curve, cfg)
+
+    # ============================================================
+    # FIGURE
+    # ============================================================
+    fig = plt.figure(figsize=(W, H), dpi=DPI)
+    # margens fixas (equivalentes ao tight_layout desta cena), sem solver
+    fig.subplots_adjust(left=0.066, right=0.940, top=0.932, bottom=0.087)
+
+    # ============================================================
+    # Per-frame arrays (só dependem de i -> calculados uma vez)
+    # ============================================================
+    t_arr = np.arange(i0, i1) / FPS
+    tau_arr = t_arr % t_cycle
+    # progresso até tau (t_curve é crescente -> views t_curve[:k], sem cópia)
+    k_arr = np.searchsorted(t_curve, tau_arr, side="right")
+    # volume actual: interpolação linear na curva já calculada
+    v_now_arr = np.interp(tau_arr, t_curve, v_curve)
+    # fase de cada frame (o badge só escolhe o texto já formatado)
+    ph_arr = np.digitize(tau_arr, phase_bounds(cfg)).astype(np.uint8)
+
+    # ============================================================
+    # STATIC SCENE (desenhada uma única vez)
+    # ============================================================
     ax = fig.add_subplot(1, 1, 1)
 
     # =========================
     # BACKGROUND BANDS (claras e correctas)
     # =========================
-    ax.axhspan(0, RV, facecolor="#f1d9a6", alpha=0.75)                   # VR
-    ax.axhspan(RV, FRC, facecolor="#edd09a", alpha=0.70)                 # VRE
-    ax.axhspan(FRC, FRC + VT, facecolor="#f2e6c8", alpha=0.65)           # VT
-    ax.axhspan(FRC + VT, TLC, facecolor="#f6f0df", alpha=0.85)           # VRI
+    # uma só imagem RGBA (1 linha por mL) em vez de 4 axhspan
+    bands = [
+        (0, rv, "#f1d9a6", 0.75),                   # VR
+        (rv, frc, "#edd09a", 0.70),                 # VRE
+        (frc, frc + vt, "#f2e6c8", 0.65),           # VT
+        (frc + vt, tlc, "#f6f0df", 0.85),           # VRI
+    ]
+    band_img = np.empty((int(round(tlc)), 1, 4), dtype=np.uint8)
+    band_img[..., 3] = 255
+    for y0, y1, color, alpha in bands:
+        rgb = alpha * np.asarray(to_rgb(color)) + (1.0 - alpha)  # alpha misturado sobre o branco dos eixos
+        band_img[int(round(y0)):int(round(y1)), 0, :3] = np.round(rgb * 255)
+    ax.imshow(band_img, origin="lower", extent=[0, t_cycle, 0, tlc],
+              aspect="auto", interpolation="nearest", zorder=0)
 
     # =========================
-    # CURVA (ref cinza + progresso vermelho)
+    # CURVA (ref cinza)
     # =========================
     ax.plot(t_curve, v_curve, lw=2.2, color="#9ca3af", alpha=0.40, zorder=2)
-    ax.plot(t_prog, v_prog, lw=3.6, color="#d4382c", zorder=4)
-    ax.scatter([tau], [v_now], s=85, color="#2563eb", zorder=6)
 
     # =========================
     # AXES / GRID
     # =========================
-    ax.set_xlim(0, T_CYCLE)
-    ax.set_ylim(0, TLC)
-    ax.set_yticks(np.arange(0, TLC + 1, 1000))
+    ax.set_xlim(0, t_cycle)
+    ax.set_ylim(0, tlc)
+    ax.set_yticks(np.arange(0, tlc + 1, 1000))
     ax.set_ylabel("Volume pulmonar (mL)", fontsize=13, weight="bold")
     ax.set_xlabel("Tempo (s)", fontsize=13, weight="bold")
     ax.grid(True, alpha=0.15)
@@ -218,25 +258,25 @@ for i in range(total_frames):
     # =========================
     # LINHAS DE REFERÊNCIA (CRF tem de saltar à vista)
     # =========================
-    ax.axhline(RV, color="#111827", lw=2.2, zorder=3)
-    ax.axhline(FRC, color="#111827", lw=2.6, ls="--", alpha=0.85, zorder=3)
-    ax.axhline(FRC + VT, color="#111827", lw=1.6, ls=":", alpha=0.70, zorder=3)
-    ax.axhline(TLC, color="#111827", lw=2.2, zorder=3)
+    ax.axhline(rv, color="#111827", lw=2.2, zorder=3)
+    ax.axhline(frc, color="#111827", lw=2.6, ls="--", alpha=0.85, zorder=3)
+    ax.axhline(frc + vt, color="#111827", lw=1.6, ls=":", alpha=0.70, zorder=3)
+    ax.axhline(tlc, color="#111827", lw=2.2, zorder=3)
 
     # =========================
     # RÓTULOS PRINCIPAIS (sem poluição)
     # =========================
     # VR bem evidente na faixa inferior
-    label_box(ax, 0.6, RV * 0.45, "VR (RV)\nVolume residual", fs=12)
+    label_box(ax, 0.6, rv * 0.45, "VR (RV)\nVolume residual", fs=12)
 
     # VRE no meio (RV->CRF)
-    label_box(ax, 0.6, RV + (FRC - RV) * 0.55, "VRE (ERV)\nReserva expiratória", fs=12)
+    label_box(ax, 0.6, rv + (frc - rv) * 0.55, "VRE (ERV)\nReserva expiratória", fs=12)
 
     # CRF como âncora (seta para a linha tracejada)
     ax.annotate(
         "CRF (FRC) = VR + VRE",
-        xy=(2.5, FRC),
-        xytext=(0.7, FRC + 260),
+        xy=(2.5, frc),
+        xytext=(0.7, frc + 260),
         fontsize=12, weight="bold", color="#111827",
         bbox=dict(boxstyle="round,pad=0.25", facecolor="white", edgecolor="#e5e7eb", alpha=0.92),
         arrowprops=dict(arrowstyle="->", lw=2.0, color="#111827"),
@@ -245,28 +285,28 @@ for i in range(total_frames):
 
     # VT (CRF -> CRF+VT)
     x_vt = 8.0
-    ax.annotate("", xy=(x_vt, FRC + VT), xytext=(x_vt, FRC),
+    ax.annotate("", xy=(x_vt, frc + vt), xytext=(x_vt, frc),
                 arrowprops=dict(arrowstyle="<->", lw=2.2, color="#111827"))
-    label_box(ax, x_vt + 0.4, FRC + VT/2, "VT\nRespiração tranquila", fs=11)
+    label_box(ax, x_vt + 0.4, frc + vt/2, "VT\nRespiração tranquila", fs=11)
 
     # VRI (CRF+VT -> TLC)
     x_irv = 11.2
-    ax.annotate("", xy=(x_irv, TLC), xytext=(x_irv, FRC + VT),
+    ax.annotate("", xy=(x_irv, tlc), xytext=(x_irv, frc + vt),
                 arrowprops=dict(arrowstyle="<->", lw=2.2, color="#111827"))
-    label_box(ax, x_irv + 0.4, (TLC + (FRC + VT)) / 2, "VRI (IRV)\nReserva inspiratória", fs=11)
+    label_box(ax, x_irv + 0.4, (tlc + (frc + vt)) / 2, "VRI (IRV)\nReserva inspiratória", fs=11)
 
     # CPT label no topo (limpo)
-    label_box(ax, 0.6, TLC - 140, "CPT (TLC)\nCapacidade pulmonar total", fs=12)
+    label_box(ax, 0.6, tlc - 140, "CPT (TLC)\nCapacidade pulmonar total", fs=12)
 
     # =========================
     # CAPACIDADES À DIREITA (separadas, claras, sem colisões)
     # =========================
-    xr = T_CYCLE - 1.7
+    xr = t_cycle - 1.7
 
     # CI: FRC -> TLC
-    ax.annotate("", xy=(xr, TLC), xytext=(xr, FRC),
+    ax.annotate("", xy=(xr, tlc), xytext=(xr, frc),
                 arrowprops=dict(arrowstyle="<->", lw=2.4, color="#111827"))
-    ax.text(xr + 0.35, (FRC + TLC) / 2,
+    ax.text(xr + 0.35, (frc + tlc) / 2,
             "CI (IC)\ncapacidade\ninspiratória",
             fontsize=11, va="center", color="#111827",
             bbox=dict(boxstyle="round,pad=0.22", facecolor="white", edgecolor="#e5e7eb", alpha=0.92),
@@ -274,9 +314,9 @@ for i in range(total_frames):
 
     # CV: RV -> TLC (um pouco mais à direita)
     xr2 = xr + 0.6
-    ax.annotate("", xy=(xr2, TLC), xytext=(xr2, RV),
+    ax.annotate("", xy=(xr2, tlc), xytext=(xr2, rv),
                 arrowprops=dict(arrowstyle="<->", lw=2.4, color="#111827"))
-    ax.text(xr2 + 0.35, (RV + TLC) / 2,
+    ax.text(xr2 + 0.35, (rv + tlc) / 2,
             "CV (VC)\ncapacidade\nvital",
             fontsize=11, va="center", color="#111827",
             bbox=dict(boxstyle="round,pad=0.22", facecolor="white", edgecolor="#e5e7eb", alpha=0.92),
@@ -284,28 +324,111 @@ for i in range(total_frames):
 
     # CPT: 0 -> TLC (mais à direita ainda, só a seta + rótulo curto)
     xr3 = xr2 + 0.6
-    ax.annotate("", xy=(xr3, TLC), xytext=(xr3, 0),
+    ax.annotate("", xy=(xr3, tlc), xytext=(xr3, 0),
                 arrowprops=dict(arrowstyle="<->", lw=2.4, color="#111827"))
-    ax.text(xr3 + 0.32, TLC * 0.50, "CPT\n(TLC)",
+    ax.text(xr3 + 0.32, tlc * 0.50, "CPT\n(TLC)",
             fontsize=11, va="center", color="#111827",
             bbox=dict(boxstyle="round,pad=0.18", facecolor="white", edgecolor="#e5e7eb", alpha=0.92),
             zorder=20)
 
     # =========================
-    # BADGE DE FASE (top-left)
+    # ARTISTAS DINÂMICOS (blitting)
     # =========================
-    ax.text(
-        0.02, 0.98,
-        f"Fase: {PHASE_LABEL.get(ph, ph)}",
+    prog_line, = ax.plot([], [], lw=3.6, color="#d4382c", zorder=4, animated=True)
+    dot = ax.scatter([], [], s=85, color="#2563eb", zorder=6, animated=True)
+
+    # BADGE DE FASE (top-left)
+    phase_txt = ax.text(
+        0.02, 0.98, "",
         transform=ax.transAxes,
         ha="left", va="top",
         fontsize=12.5, weight="bold", color="#111827",
         bbox=dict(boxstyle="round,pad=0.35", facecolor="white", edgecolor="#e5e7eb", alpha=0.95),
-        zorder=30
+        zorder=30, animated=True
     )
 
-    fig.tight_layout()
-    writer.append_data(canvas_to_rgb(fig))
+    # rótulos acima da curva (zorder > progresso) saem do fundo e são
+    # redesenhados por cima do progresso, mantendo a ordem original
+    overlay = [a for a in ax.get_children() if a.get_zorder() > prog_line.get_zorder()]
+    for a in overlay:
+        a.set_animated(True)
+    overlay = sorted(overlay + [prog_line], key=lambda a: a.get_zorder())
 
-writer.close()
-print("OK ->", OUT)
+    # frame de prova: resolução exacta e nada cortado antes de abrir o encoder
+    fig.canvas.draw()
+    # vista fixa sobre o buffer do Agg (o renderer não muda de tamanho):
+    # repor o fundo e escrever no ffmpeg usam sempre a mesma memória
+    frame_buf = np.asarray(fig.canvas.buffer_rgba())
+    bg_rgba = frame_buf.copy()  # fundo estático (uint8 HxWx4)
+
+    size = fig.canvas.get_width_height()
+    if size != (round(W * DPI), round(H * DPI)):
+        raise RuntimeError(f"canvas {size} != {W * DPI:.0f}x{H * DPI:.0f}")
+    tight = ax.get_tightbbox(fig.canvas.get_renderer())
+    if not fig.bbox.contains(tight.x0, tight.y0) or not fig.bbox.contains(tight.x1, tight.y1):
+        raise RuntimeError(f"layout sai do frame: {tight}")
+
+    # só a zona que muda é reposta em cada frame: os eixos (curva, ponto, badge)
+    # mais a pegada real dos rótulos redesenhados (caixas saem dos eixos à direita);
+    # bg_rgba não tem os rótulos, logo a pegada é onde desenhá-los muda pixels
+    for a in overlay:
+        ax.draw_artist(a)
+    ys, xs = np.nonzero((frame_buf != bg_rgba).any(axis=2))
+    h_px, w_px = frame_buf.shape[:2]
+    r0 = max(min(int(h_px - ax.bbox.y1), ys.min()) - 2, 0)
+    r1 = min(max(int(np.ceil(h_px - ax.bbox.y0)), ys.max() + 1) + 2, h_px)
+    c0 = max(min(int(ax.bbox.x0), xs.min()) - 2, 0)
+    c1 = min(max(int(np.ceil(ax.bbox.x1)), xs.max() + 1) + 2, w_px)
+    dirty = Bbox.from_extents(c0, h_px - r1, c1, h_px - r0)
+    dirty_buf, dirty_bg = frame_buf[r0:r1, c0:c1], bg_rgba[r0:r1, c0:c1]
+
+    proc = open_ffmpeg(out_path, size, FPS, threads)
+
+    for i in range(i1 - i0):
+        np.copyto(dirty_buf, dirty_bg)  # repõe o fundo só na zona que muda
+        k = k_arr[i]
+        prog_line.set_data(t_curve[:k], v_curve[:k])
+        dot.set_offsets([[tau_arr[i], v_now_arr[i]]])
+        phase_txt.set_text(LABELS[ph_arr[i]])
+
+        for a in overlay:
+            ax.draw_artist(a)
+        fig.canvas.blit(dirty)
+
+        proc.stdin.write(frame_buf)
+
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f"ffmpeg falhou (código {proc.returncode})")
+    plt.close(fig)
+    return out_path
+
+def render_all(configs, n_chunks=None):
+    """
+    Parte cada vídeo em n_chunks segmentos contíguos e renderiza todos
+    (de todas as variantes) num só pool de processos; depois concatena.
+    """
+    n_cpu = os.cpu_count() or 1
+    n_chunks = n_chunks or n_cpu
+    bounds = np.linspace(0, TOTAL_FRAMES, n_chunks + 1).astype(int)
+    # 1 processo por core; com vários jobs cada x264 fica com 1 thread
+    # (com -threads 0 cada um abriria ~1.5x cores threads)
+    n_jobs = len(configs) * n_chunks
+    threads = 0 if n_jobs == 1 else 1
+    with tempfile.TemporaryDirectory() as tmp, \
+            ProcessPoolExecutor(max_workers=min(n_jobs, n_cpu)) as pool:
+        jobs = {
+            out: [
+                pool.submit(render_range, cfg, i0, i1,
+                            os.path.join(tmp, f"{n}_{j:03d}.mp4"), threads)
+                for j, (i0, i1) in enumerate(zip(bounds[:-1], bounds[1:]))
+                if i1 > i0
+            ]
+            for n, (out, cfg) in enumerate(configs.items())
+        }
+        for out, futures in jobs.items():
+            concat_segments([fut.result() for fut in futures], out)
+            print("OK ->", out)
+
+if __name__ == "__main__":
+    render_all(CONFIGS)